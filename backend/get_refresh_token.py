@@ -1,21 +1,24 @@
-
 # get_refresh_token.py
 
 import os
+import json
 from dotenv import load_dotenv
 import secrets
+import threading
+import webbrowser
+import urllib.error
 import urllib.parse
-from flask import Flask, request
-import requests
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 """
 One-time helper to obtain a Google OAuth refresh token for Calendar API.
 
 How it works:
 - Starts a local server at http://localhost:8787
-- Opens an authorization URL you paste into a browser
+- Opens the authorization URL in your browser (or paste it in yourself)
 - Google redirects back with a code
-- Script exchanges code for tokens and prints the refresh_token
+- Script exchanges code for tokens, prints the refresh_token and exits
 
 Required env vars:
 - GOOGLE_CLIENT_ID
@@ -40,12 +43,10 @@ if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
 REDIRECT_URI = f"http://localhost:{PORT}/oauth2callback"
 SCOPE = "https://www.googleapis.com/auth/calendar.events"
 
-app = Flask(__name__)
 STATE = secrets.token_urlsafe(16)
 
-@app.route("/")
-def index():
-    params = {
+AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth?" + urllib.parse.urlencode(
+    {
         "client_id": GOOGLE_CLIENT_ID,
         "redirect_uri": REDIRECT_URI,
         "response_type": "code",
@@ -54,39 +55,52 @@ def index():
         "prompt": "consent",           # force refresh_token issuance (important)
         "state": STATE,
     }
-    url = "https://accounts.google.com/o/oauth2/v2/auth?" + urllib.parse.urlencode(params)
-    return (
-        "<h2>Google OAuth Refresh Token Helper</h2>"
-        "<p>1) Click the link below and complete consent.</p>"
-        f'<p><a href="{url}">Authorize with Google</a></p>'
-        "<p>2) After approving, you’ll be redirected back and the refresh token will be shown.</p>"
-    )
+)
 
-@app.route("/oauth2callback")
-def oauth2callback():
-    if request.args.get("state") != STATE:
-        return "State mismatch. Abort.", 400
 
-    code = request.args.get("code")
-    if not code:
-        return f"Missing code. Params: {dict(request.args)}", 400
-
-    token_resp = requests.post(
-        "https://oauth2.googleapis.com/token",
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        data={
+def exchange_code(code):
+    data = urllib.parse.urlencode(
+        {
             "code": code,
             "client_id": GOOGLE_CLIENT_ID,
             "client_secret": GOOGLE_CLIENT_SECRET,
             "redirect_uri": REDIRECT_URI,
             "grant_type": "authorization_code",
-        },
-        timeout=20,
+        }
+    ).encode("utf-8")
+    req = urllib.request.Request(
+        "https://oauth2.googleapis.com/token",
+        data=data,
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
     )
+    try:
+        with urllib.request.urlopen(req, timeout=20) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
 
-    token_json = token_resp.json()
-    if token_resp.status_code != 200:
-        return f"Token exchange failed: {token_json}", 500
+
+def index():
+    return (
+        "<h2>Google OAuth Refresh Token Helper</h2>"
+        "<p>1) Click the link below and complete consent.</p>"
+        f'<p><a href="{AUTH_URL}">Authorize with Google</a></p>'
+        "<p>2) After approving, you’ll be redirected back and the refresh token will be shown.</p>"
+    ), 200
+
+
+def oauth2callback(args):
+    """Returns (html, status, done); done is True once a refresh token was obtained."""
+    if args.get("state") != STATE:
+        return "State mismatch. Abort.", 400, False
+
+    code = args.get("code")
+    if not code:
+        return f"Missing code. Params: {args}", 400, False
+
+    status, token_json = exchange_code(code)
+    if status != 200:
+        return f"Token exchange failed: {token_json}", 500, False
 
     refresh_token = token_json.get("refresh_token")
     access_token = token_json.get("access_token")
@@ -104,6 +118,7 @@ def oauth2callback():
             "</ul>"
             f"<pre>{token_json}</pre>",
             200,
+            False,
         )
 
     # Print to terminal too (handy)
@@ -115,9 +130,39 @@ def oauth2callback():
         "<h2>Success ✅</h2>"
         "<p>Copy this refresh token and store it as a Cloudflare Worker secret:</p>"
         f"<pre>{refresh_token}</pre>"
-        "<p>You can now close this tab.</p>"
+        "<p>You can now close this tab.</p>",
+        200,
+        True,
     )
 
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        done = False
+        if url.path == "/":
+            html, status = index()
+        elif url.path == "/oauth2callback":
+            args = dict(urllib.parse.parse_qsl(url.query))
+            html, status, done = oauth2callback(args)
+        else:
+            html, status = "Not found", 404
+
+        payload = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        if done:
+            # shutdown() blocks until serve_forever returns, so it can't run on this thread.
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
 if __name__ == "__main__":
-    print(f"Open http://localhost:{PORT} in your browser")
-    app.run(host="0.0.0.0", port=PORT, debug=False)
\ No newline at end of file
+    server = HTTPServer(("0.0.0.0", PORT), Handler)
+    print(f"Open http://localhost:{PORT} in your browser if it doesn't open automatically")
+    webbrowser.open(AUTH_URL)
+    server.serve_forever()
+    server.server_close()
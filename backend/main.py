@@ -1,11 +1,27 @@
 import os
+import re
+import time
+import random
+import secrets
 import hashlib
-from datetime import datetime, timedelta
-from typing import List, Optional
-
-import requests
+import asyncio
+import logging
+import urllib.parse
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timedelta, tzinfo
+from email import policy
+from email.parser import BytesParser
+from functools import lru_cache
+from typing import Annotated, List, Optional
+
+import httpx
+import orjson
+import uvicorn
+import redis.asyncio as aioredis
+from aiolimiter import AsyncLimiter
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field, EmailStr
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from dotenv import load_dotenv
 
 # Handling timezones
@@ -13,7 +29,52 @@ from dateutil import tz
 
 load_dotenv()
 
-app = FastAPI(title="Calendar Tool Service", version="1.0.0")
+# Shared client so connections to Google are pooled and reused across requests.
+# Created on startup so it binds to the event loop uvicorn is actually serving on.
+client: Optional[httpx.AsyncClient] = None
+
+# Optional; when REDIS_URL is set, workers share one access token through Redis.
+redis_client: Optional[aioredis.Redis] = None
+
+
+def _new_client() -> httpx.AsyncClient:
+    # The transport retries failed connection attempts; HTTP-level errors are not retried here.
+    # HTTP/2 lets concurrent Google calls share one connection; HTTP/1.1 stays as a fallback.
+    return httpx.AsyncClient(
+        timeout=GOOGLE_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        ),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, redis_client
+    client = _new_client()
+    if REDIS_URL:
+        redis_client = aioredis.from_url(REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+    refresher = None
+    if TOKEN_REFRESHER_ENABLED and GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET and GOOGLE_REFRESH_TOKEN:
+        refresher = asyncio.create_task(_token_refresher())
+    yield
+    if refresher is not None:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+    await client.aclose()
+    if redis_client is not None:
+        await redis_client.aclose()
+
+
+app = FastAPI(
+    title="Calendar Tool Service",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 
@@ -23,17 +84,82 @@ GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "").strip()
 GOOGLE_REFRESH_TOKEN = os.getenv("GOOGLE_REFRESH_TOKEN", "").strip()
 CALENDAR_ID = os.getenv("CALENDAR_ID", "primary").strip()
 DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "America/Los_Angeles").strip()
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+
+# Built once; only the Authorization header changes per request.
+_CAL_PATH = f"/calendar/v3/calendars/{urllib.parse.quote(CALENDAR_ID, safe='')}/events"
+_CAL_URL = f"https://www.googleapis.com{_CAL_PATH}"
+_BASE_HEADERS = {"Content-Type": "application/json"}
+
+logger = logging.getLogger(__name__)
+
+# Access tokens live ~1h; refresh this many seconds before Google says they expire.
+TOKEN_EXPIRY_MARGIN = 60
 
+# Opt-in background refresh, started TOKEN_REFRESH_LEAD seconds before the cached token expires.
+# With REDIS_URL set, workers coordinate so only one of them calls Google per refresh.
+TOKEN_REFRESHER_ENABLED = os.getenv("TOKEN_REFRESHER_ENABLED", "") == "1"
+TOKEN_REFRESH_LEAD = 300
+TOKEN_REFRESH_RETRY_DELAY = 30
 
+GOOGLE_TIMEOUT = 20
+
+# Google asks clients to back off exponentially on rate limits and transient server errors.
+RETRIABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+# Only errors raised before the request reaches Google; a read timeout may follow a successful insert.
+RETRIABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Cap concurrent and per-second calls to Google so load spikes don't turn into 429 storms.
+# Both limits are per worker process.
+GOOGLE_MAX_INFLIGHT = int(os.getenv("GOOGLE_MAX_INFLIGHT", "10"))
+GOOGLE_MAX_RPS = float(os.getenv("GOOGLE_MAX_RPS", "10"))
+if GOOGLE_MAX_INFLIGHT < 1 or GOOGLE_MAX_RPS <= 0:
+    raise RuntimeError("GOOGLE_MAX_INFLIGHT must be >= 1 and GOOGLE_MAX_RPS must be > 0.")
+
+# Google caps a batch request at 50 calls for Calendar.
+BATCH_MAX_SIZE = 50
+BATCH_BOUNDARY = "batch_calendar_events"
+
+# Shared token entry is keyed by the refresh token so different credentials never collide.
+_REDIS_TOKEN_KEY = "oauth:google:" + hashlib.sha256(GOOGLE_REFRESH_TOKEN.encode("utf-8")).hexdigest()
+_REDIS_LOCK_KEY = "lock:" + _REDIS_TOKEN_KEY
+# Long enough to cover a refresh that times out and backs off on every attempt.
+REDIS_LOCK_TTL = int(RETRY_MAX_ATTEMPTS * (GOOGLE_TIMEOUT + RETRY_MAX_DELAY)) + 5
+# Delete the lock only if we still hold it; it may have expired and been taken by another worker.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_TOKEN_CACHE = {"token": None, "exp": 0.0}
+_TOKEN_LOCK = asyncio.Lock()
+
+_google_sem = asyncio.Semaphore(GOOGLE_MAX_INFLIGHT)
+# AsyncLimiter needs at least one call per period, so sub-1 rates stretch the period instead.
+_rate_limiter = AsyncLimiter(GOOGLE_MAX_RPS, 1) if GOOGLE_MAX_RPS >= 1 else AsyncLimiter(1, 1 / GOOGLE_MAX_RPS)
+
+
+
+
+# Shape check only; pydantic-core runs it natively, and Google rejects undeliverable invitees anyway.
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+Email = Annotated[str, StringConstraints(pattern=EMAIL_PATTERN, max_length=254)]
 
 
 class CreateEventRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     name: str = Field(..., min_length=1, max_length=120)
     title: str = Field("Meeting", min_length=1, max_length=200)
     start: datetime  # Expect ISO-8601; ideally with offset or Z
     durationMinutes: int = Field(30, ge=15, le=240)
     timezone: str = Field(default=DEFAULT_TIMEZONE, min_length=1, max_length=64)
-    invitees: Optional[List[EmailStr]] = None
+    invitees: Optional[List[Email]] = None
 
 
 class CreateEventResponse(BaseModel):
@@ -46,6 +172,12 @@ class CreateEventResponse(BaseModel):
     requestId: str
 
 
+class BatchEventResult(BaseModel):
+    index: int
+    event: Optional[CreateEventResponse] = None
+    error: Optional[str] = None
+
+
 def _require_env():
     if not (GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET and GOOGLE_REFRESH_TOKEN):
         raise HTTPException(
@@ -54,9 +186,35 @@ def _require_env():
         )
 
 
-def _get_access_token() -> str:
-    _require_env()
-    resp = requests.post(
+def _retry_delay(resp: Optional[httpx.Response], attempt: int) -> float:
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(RETRY_MAX_DELAY, float(retry_after))
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.uniform(0, 0.25)
+
+
+async def _request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    for attempt in range(RETRY_MAX_ATTEMPTS):
+        last_attempt = attempt == RETRY_MAX_ATTEMPTS - 1
+        try:
+            async with _google_sem, _rate_limiter:
+                resp = await client.request(method, url, **kwargs)
+        except RETRIABLE_ERRORS:
+            if last_attempt:
+                raise
+            resp = None
+        else:
+            if resp.status_code not in RETRIABLE_STATUSES or last_attempt:
+                return resp
+        await asyncio.sleep(_retry_delay(resp, attempt))
+
+
+async def _post_with_retry(url: str, **kwargs) -> httpx.Response:
+    return await _request_with_retry("POST", url, **kwargs)
+
+
+async def _refresh_access_token() -> str:
+    resp = await _post_with_retry(
         "https://oauth2.googleapis.com/token",
         headers={"Content-Type": "application/x-www-form-urlencoded"},
         data={
@@ -65,62 +223,313 @@ def _get_access_token() -> str:
             "refresh_token": GOOGLE_REFRESH_TOKEN,
             "grant_type": "refresh_token",
         },
-        timeout=20,
     )
-    data = resp.json()
+    data = orjson.loads(resp.content)
     if resp.status_code != 200 or "access_token" not in data:
         raise HTTPException(status_code=502, detail=f"Google token refresh failed: {data}")
+
+    expires_in = int(data.get("expires_in", 3600))
+    _TOKEN_CACHE["token"] = data["access_token"]
+    _TOKEN_CACHE["exp"] = time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN
     return data["access_token"]
 
 
+def _cache_token(token: str, exp_wall: float) -> str:
+    # Redis stores wall-clock expiry; the local cache compares against the monotonic clock.
+    _TOKEN_CACHE["token"] = token
+    _TOKEN_CACHE["exp"] = time.monotonic() + exp_wall - time.time()
+    return token
+
+
+async def _read_shared_token() -> Optional[str]:
+    raw = await redis_client.get(_REDIS_TOKEN_KEY)
+    if not raw:
+        return None
+    entry = orjson.loads(raw)
+    if time.time() >= entry["exp"]:
+        return None
+    return _cache_token(entry["access_token"], entry["exp"])
+
+
+async def _publish_shared_token(token: str):
+    ttl = _TOKEN_CACHE["exp"] - time.monotonic()
+    entry = {"access_token": token, "exp": time.time() + ttl}
+    await redis_client.set(_REDIS_TOKEN_KEY, orjson.dumps(entry), ex=max(1, int(ttl)))
+
+
+async def _acquire_refresh_lock() -> Optional[str]:
+    owner = secrets.token_hex(16)
+    if await redis_client.set(_REDIS_LOCK_KEY, owner, nx=True, ex=REDIS_LOCK_TTL):
+        return owner
+    return None
+
+
+async def _release_refresh_lock(owner: str):
+    await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, _REDIS_LOCK_KEY, owner)
+
+
+async def _refresh_shared_token() -> str:
+    # Only the worker holding the lock talks to Google; the rest wait for its result.
+    # If the holder fails, the lock is released and the next waiter takes over.
+    deadline = time.monotonic() + REDIS_LOCK_TTL
+    while True:
+        token = await _read_shared_token()
+        if token:
+            return token
+
+        owner = await _acquire_refresh_lock()
+        if owner:
+            try:
+                token = await _refresh_access_token()
+                await _publish_shared_token(token)
+                return token
+            finally:
+                await _release_refresh_lock(owner)
+
+        if time.monotonic() >= deadline:
+            # Lock holder is stuck past its own TTL; don't make the request wait any longer.
+            return await _refresh_access_token()
+        await asyncio.sleep(0.1)
+
+
+async def _get_access_token() -> str:
+    _require_env()
+    if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["exp"]:
+        return _TOKEN_CACHE["token"]
+
+    async with _TOKEN_LOCK:
+        # Another request may have refreshed while we waited for the lock.
+        if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["exp"]:
+            return _TOKEN_CACHE["token"]
+        if redis_client is not None:
+            try:
+                return await _refresh_shared_token()
+            except aioredis.RedisError as e:
+                logger.warning("Redis token cache unavailable, using local cache: %s", e)
+        if _TOKEN_CACHE["token"] and time.monotonic() < _TOKEN_CACHE["exp"]:
+            return _TOKEN_CACHE["token"]
+        return await _refresh_access_token()
+
+
+async def _refresh_ahead():
+    async with _TOKEN_LOCK:
+        if redis_client is None:
+            await _refresh_access_token()
+            return
+
+        # Another worker may already have refreshed; otherwise whoever takes the lock does it.
+        token = await _read_shared_token()
+        if token and _TOKEN_CACHE["exp"] - time.monotonic() > TOKEN_REFRESH_LEAD:
+            return
+        owner = await _acquire_refresh_lock()
+        if owner:
+            try:
+                await _publish_shared_token(await _refresh_access_token())
+            finally:
+                await _release_refresh_lock(owner)
+
+
+async def _token_refresher():
+    # Refresh ahead of expiry so requests never wait on the token endpoint.
+    while True:
+        try:
+            await _refresh_ahead()
+        except Exception:
+            # Keep the loop alive whatever went wrong; requests still refresh on demand.
+            logger.exception("Background token refresh failed")
+            await asyncio.sleep(TOKEN_REFRESH_RETRY_DELAY)
+            continue
+        await asyncio.sleep(max(TOKEN_REFRESH_RETRY_DELAY, _TOKEN_CACHE["exp"] - time.monotonic() - TOKEN_REFRESH_LEAD))
+
+
+async def _invalidate_access_token():
+    _TOKEN_CACHE["token"] = None
+    _TOKEN_CACHE["exp"] = 0.0
+    if redis_client is not None:
+        try:
+            await redis_client.delete(_REDIS_TOKEN_KEY)
+        except aioredis.RedisError as e:
+            logger.warning("Could not clear shared token in Redis: %s", e)
+
+
 def _make_request_id(payload: CreateEventRequest) -> str:
     # Simple idempotency hint; you can store/verify later if you add a DB.
-    key = f"{payload.name}|{payload.title}|{payload.start.isoformat()}|{payload.durationMinutes}|{payload.timezone}|{payload.invitees or []}"
-    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    # Feed fields straight into the hash rather than building one big key string.
+    h = hashlib.sha256()
+    h.update(payload.name.encode("utf-8"))
+    h.update(b"|")
+    h.update(payload.title.encode("utf-8"))
+    h.update(b"|")
+    h.update(payload.start.isoformat().encode("utf-8"))
+    h.update(f"|{payload.durationMinutes}|".encode("utf-8"))
+    h.update(payload.timezone.encode("utf-8"))
+    for addr in payload.invitees or ():
+        h.update(b"|")
+        h.update(addr.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+async def _insert_event(access_token: str, body: dict) -> httpx.Response:
+    return await _post_with_retry(
+        _CAL_URL,
+        headers={**_BASE_HEADERS, "Authorization": f"Bearer {access_token}"},
+        content=orjson.dumps(body),
+    )
+
+
+async def _existing_event(event_id: str):
+    # Inserts carry a deterministic id, so a 409 means this event was already created,
+    # e.g. by an earlier attempt whose response was lost to a 5xx or timeout.
+    resp = await _request_with_retry(
+        "GET",
+        f"{_CAL_URL}/{event_id}",
+        headers={"Authorization": f"Bearer {await _get_access_token()}"},
+    )
+    data = orjson.loads(resp.content)
+    if resp.status_code == 200 and data.get("status") == "cancelled":
+        return 409, {"error": "An identical event was created earlier and has since been deleted."}
+    return resp.status_code, data
+
+
+def _encode_batch(bodies: List[dict]) -> bytes:
+    parts = []
+    for i, body in enumerate(bodies):
+        head = (
+            f"--{BATCH_BOUNDARY}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item{i}>\r\n"
+            "\r\n"
+            f"POST {_CAL_PATH} HTTP/1.1\r\n"
+            "Content-Type: application/json\r\n"
+            "\r\n"
+        )
+        parts += (head.encode("utf-8"), orjson.dumps(body), b"\r\n")
+    parts.append(f"--{BATCH_BOUNDARY}--\r\n".encode("utf-8"))
+    return b"".join(parts)
+
+
+def _decode_batch(resp: httpx.Response, count: int):
+    # Let the email parser split multipart/mixed; each part wraps a raw HTTP response.
+    raw = f"Content-Type: {resp.headers['Content-Type']}\r\n\r\n".encode("utf-8") + resp.content
+    message = BytesParser(policy=policy.HTTP).parsebytes(raw)
+
+    results = [(502, {"error": "missing from batch response"})] * count
+    for part in message.iter_parts():
+        content_id = (part["Content-ID"] or "").strip("<>")
+        index = content_id[len("response-item"):]
+        if not content_id.startswith("response-item") or not index.isdigit() or int(index) >= count:
+            continue
+        index = int(index)
+
+        # One malformed part shouldn't cost us the results of the others.
+        try:
+            head, body = re.split(rb"\r?\n\r?\n", part.get_payload(decode=True) or b"", maxsplit=1)
+            status = int(head.split(None, 2)[1])
+        except (ValueError, IndexError):
+            results[index] = (502, {"error": "malformed part in batch response"})
+            continue
+        try:
+            data = orjson.loads(body) if body.strip() else {}
+        except ValueError:
+            data = {"error": body.decode("utf-8", "replace")}
+        results[index] = (status, data)
+    return results
+
+
+async def _post_batch(access_token: str, payload: bytes) -> httpx.Response:
+    return await _post_with_retry(
+        "https://www.googleapis.com/batch/calendar/v3",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": f"multipart/mixed; boundary={BATCH_BOUNDARY}",
+        },
+        content=payload,
+    )
+
+
+async def _send_batch(bodies: List[dict]):
+    resp = await _post_batch(await _get_access_token(), _encode_batch(bodies))
+    if resp.status_code == 401:
+        return [(401, {"error": resp.text})] * len(bodies)
+    if resp.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"Google Calendar batch insert failed: {resp.text}")
+    return _decode_batch(resp, len(bodies))
+
+
+async def _insert_events_batch(bodies: List[dict]):
+    results = await _send_batch(bodies)
+
+    # Google reports auth failures per part; refresh once and resend only those parts,
+    # since the rest are already on the calendar.
+    unauthorized = [i for i, (status, _) in enumerate(results) if status == 401]
+    if unauthorized:
+        # The other parts are already settled; a failed resend only affects the 401 ones.
+        try:
+            await _invalidate_access_token()
+            retried = await _send_batch([bodies[i] for i in unauthorized])
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else repr(e)
+            retried = [(502, {"error": error})] * len(unauthorized)
+        for i, result in zip(unauthorized, retried):
+            results[i] = result
+
+    conflicts = [i for i, (status, _) in enumerate(results) if status == 409]
+    if conflicts:
+        existing = await asyncio.gather(
+            *(_existing_event(bodies[i]["id"]) for i in conflicts), return_exceptions=True
+        )
+        for i, result in zip(conflicts, existing):
+            if isinstance(result, BaseException):
+                error = result.detail if isinstance(result, HTTPException) else repr(result)
+                result = (502, {"error": error})
+            results[i] = result
+    return results
 
 
 @app.get("/health")
-def health():
+async def health():
     return {"ok": True}
 
 
 
-def normalize_start_end(start_dt: datetime, duration_minutes: int, timezone: str):
-    tzinfo = tz.gettz(timezone)
-    if tzinfo is None:
-        raise HTTPException(status_code=400, detail=f"Invalid timezone: {timezone}")
+@lru_cache(maxsize=256)
+def _gettz(name: str) -> tzinfo:
+    tzi = tz.gettz(name)
+    if tzi is None:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone: {name}")
+    return tzi
 
+
+def normalize_start_end(start_dt: datetime, duration_minutes: int, tzi: tzinfo):
     # If naive, assume it's already in the requested timezone.
     if start_dt.tzinfo is None:
-        start_local = start_dt.replace(tzinfo=tzinfo)
+        start_local = start_dt.replace(tzinfo=tzi)
     else:
         # If aware (Z/offset), convert the instant into the requested timezone.
-        start_local = start_dt.astimezone(tzinfo)
+        start_local = start_dt.astimezone(tzi)
 
     end_local = start_local + timedelta(minutes=duration_minutes)
     return start_local, end_local
 
 
-@app.post("/create-event", response_model=CreateEventResponse)
-def create_event(req: CreateEventRequest):
-    _require_env()
+def _build_event(req: CreateEventRequest):
+    tzi = _gettz(req.timezone)
 
     # Normalize to the user's timezone without changing minutes/seconds
-    start_local, end_local = normalize_start_end(req.start, req.durationMinutes, req.timezone)
+    start_local, end_local = normalize_start_end(req.start, req.durationMinutes, tzi)
 
-    # Reject if in the past (compare in same timezone)
-    tzinfo = tz.gettz(req.timezone)
-    now_local = datetime.now(tzinfo)
-    if start_local < now_local:
+    # Reject if in the past (compare the absolute instants)
+    if start_local.timestamp() < time.time():
         raise HTTPException(
             status_code=400,
             detail=f"Start time is in the past for timezone {req.timezone}. Please choose a future time.",
         )
 
     request_id = _make_request_id(req)
-    access_token = _get_access_token()
 
     body = {
+        # Hex is valid base32hex, so the request id doubles as the event id and makes inserts idempotent.
+        "id": request_id,
         "summary": req.title or "Meeting",
         "description": f"Scheduled by voice assistant for {req.name}. RequestId: {request_id}",
         "start": {"dateTime": start_local.isoformat(), "timeZone": req.timezone},
@@ -130,20 +539,10 @@ def create_event(req: CreateEventRequest):
     if req.invitees:
         body["attendees"] = [{"email": e} for e in req.invitees]
 
-    resp = requests.post(
-        f"https://www.googleapis.com/calendar/v3/calendars/{CALENDAR_ID}/events",
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        },
-        json=body,
-        timeout=20,
-    )
+    return body, start_local, end_local, request_id
 
-    data = resp.json()
-    if resp.status_code not in (200, 201):
-        raise HTTPException(status_code=502, detail=f"Google Calendar insert failed: {data}")
 
+def _event_response(req: CreateEventRequest, data: dict, start_local: datetime, end_local: datetime, request_id: str):
     return CreateEventResponse(
         eventId=data.get("id", ""),
         htmlLink=data.get("htmlLink"),
@@ -152,4 +551,71 @@ def create_event(req: CreateEventRequest):
         end=data.get("end", {}).get("dateTime", end_local.isoformat()),
         calendarId=CALENDAR_ID,
         requestId=request_id,
-    )
\ No newline at end of file
+    )
+
+
+@app.post("/create-event", response_model=CreateEventResponse)
+async def create_event(req: CreateEventRequest):
+    _require_env()
+
+    body, start_local, end_local, request_id = _build_event(req)
+    access_token = await _get_access_token()
+
+    resp = await _insert_event(access_token, body)
+    if resp.status_code == 401:
+        # Cached token was revoked or expired early; refresh once and retry.
+        await _invalidate_access_token()
+        resp = await _insert_event(await _get_access_token(), body)
+
+    if resp.status_code == 409:
+        status, data = await _existing_event(request_id)
+    else:
+        status, data = resp.status_code, orjson.loads(resp.content)
+    if status not in (200, 201):
+        raise HTTPException(status_code=502, detail=f"Google Calendar insert failed: {data}")
+
+    return _event_response(req, data, start_local, end_local, request_id)
+
+
+@app.post("/create-events", response_model=List[BatchEventResult])
+async def create_events(reqs: List[CreateEventRequest]):
+    _require_env()
+
+    # Validate everything up front so a bad item fails the request before anything is sent.
+    built = [_build_event(req) for req in reqs]
+    bodies = [b[0] for b in built]
+
+    chunks = [bodies[i:i + BATCH_MAX_SIZE] for i in range(0, len(bodies), BATCH_MAX_SIZE)]
+    # Other chunks may already be on the calendar, so a failed chunk is reported per item, not raised.
+    chunk_results = await asyncio.gather(
+        *(_insert_events_batch(chunk) for chunk in chunks), return_exceptions=True
+    )
+
+    results = []
+    for chunk, outcome in zip(chunks, chunk_results):
+        if isinstance(outcome, BaseException):
+            error = outcome.detail if isinstance(outcome, HTTPException) else f"Google Calendar batch insert failed: {outcome!r}"
+            start = len(results)
+            results.extend([BatchEventResult(index=start + i, error=error) for i in range(len(chunk))])
+            continue
+
+        for status, data in outcome:
+            index = len(results)
+            req = reqs[index]
+            _, start_local, end_local, request_id = built[index]
+            if status in (200, 201):
+                event = _event_response(req, data, start_local, end_local, request_id)
+                results.append(BatchEventResult(index=index, event=event))
+            else:
+                results.append(BatchEventResult(index=index, error=f"Google Calendar insert failed: {data}"))
+    return results
+
+if __name__ == "__main__":
+    uvicorn.run(
+        app,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        # "auto" picks uvloop when installed; it isn't on Windows.
+        loop="auto",
+        http="httptools",
+    )
@@ -0,0 +1,190 @@
+import re
+from email import policy
+from email.parser import BytesParser
+
+import httpx
+import orjson
+from fastapi.testclient import TestClient
+
+import backend.main as main
+
+# Shaped like a real Google batch reply: parts out of order, per-part headers, CRLF line endings.
+RECORDED_BATCH_RESPONSE = (
+    b"--batch_Xb8sP2yX4NA_AAAAyQ0Y1Y8\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item1>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 403 Forbidden\r\n"
+    b"Content-Type: application/json; charset=UTF-8\r\n"
+    b"Vary: Origin\r\n"
+    b"Content-Length: 120\r\n"
+    b"\r\n"
+    b'{"error": {"errors": [{"domain": "calendar", "reason": "forbiddenForNonOrganizer"}], "code": 403, "message": "Forbidden"}}\r\n'
+    b"--batch_Xb8sP2yX4NA_AAAAyQ0Y1Y8\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item0>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json; charset=UTF-8\r\n"
+    b'ETag: "3424476438430000"\r\n'
+    b"Vary: Origin\r\n"
+    b"\r\n"
+    b'{\n "kind": "calendar#event",\n "id": "abc123",\n "status": "confirmed",\n'
+    b' "htmlLink": "https://www.google.com/calendar/event?eid=abc123",\n "summary": "Project Sync"\n}\r\n'
+    b"--batch_Xb8sP2yX4NA_AAAAyQ0Y1Y8\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item2>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 400 Bad Request\r\n"
+    b"Content-Type: application/json; charset=UTF-8\r\n"
+    b"\r\n"
+    b'{"error": {"code": 400, "message": "Invalid attendee email."}}\r\n'
+    b"--batch_Xb8sP2yX4NA_AAAAyQ0Y1Y8--\r\n"
+)
+RECORDED_CONTENT_TYPE = "multipart/mixed; boundary=batch_Xb8sP2yX4NA_AAAAyQ0Y1Y8"
+
+
+def _batch_response(content, content_type=RECORDED_CONTENT_TYPE):
+    return httpx.Response(200, content=content, headers={"Content-Type": content_type})
+
+
+def test_encode_batch_parts():
+    bodies = [{"summary": "a"}, {"summary": "b", "attendees": [{"email": "x@y.co"}]}]
+    raw = f"Content-Type: multipart/mixed; boundary={main.BATCH_BOUNDARY}\r\n\r\n".encode() + main._encode_batch(bodies)
+    parts = list(BytesParser(policy=policy.HTTP).parsebytes(raw).iter_parts())
+
+    assert [p["Content-ID"] for p in parts] == ["<item0>", "<item1>"]
+    for part, body in zip(parts, bodies):
+        assert part.get_content_type() == "application/http"
+        head, payload = part.get_payload(decode=True).split(b"\r\n\r\n", 1)
+        assert head.splitlines()[0] == f"POST {main._CAL_PATH} HTTP/1.1".encode()
+        assert orjson.loads(payload) == body
+
+
+def test_decode_recorded_batch_mixed_statuses():
+    results = main._decode_batch(_batch_response(RECORDED_BATCH_RESPONSE), 3)
+
+    assert [status for status, _ in results] == [200, 403, 400]
+    assert results[0][1]["id"] == "abc123"
+    assert results[1][1]["error"]["code"] == 403
+    assert results[2][1]["error"]["message"] == "Invalid attendee email."
+
+
+def test_decode_batch_missing_part():
+    results = main._decode_batch(_batch_response(RECORDED_BATCH_RESPONSE), 4)
+
+    assert results[3][0] == 502
+
+
+def _echo_batch(request):
+    # Answer each part in reverse order; items whose summary is "fail" get a 404.
+    body = request.content.decode()
+    ids = re.findall(r"Content-ID: <item(\d+)>", body)
+    summaries = re.findall(r'"summary":"([^"]*)"', body)
+    out = []
+    for i in reversed(range(len(ids))):
+        if summaries[i] == "fail":
+            inner = 'HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n\r\n{"error": {"code": 404}}\r\n'
+        else:
+            inner = f'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{{"id": "{summaries[i]}"}}\r\n'
+        out.append(f"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item{ids[i]}>\r\n\r\n{inner}")
+    out.append("--resp--\r\n")
+    return _batch_response("".join(out).encode(), "multipart/mixed; boundary=resp")
+
+
+def _configure(monkeypatch):
+    monkeypatch.setattr(main, "GOOGLE_CLIENT_ID", "id")
+    monkeypatch.setattr(main, "GOOGLE_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(main, "GOOGLE_REFRESH_TOKEN", "refresh")
+    monkeypatch.setattr(main, "_TOKEN_CACHE", {"token": None, "exp": 0.0})
+
+
+def test_decode_batch_malformed_part_keeps_others():
+    content = RECORDED_BATCH_RESPONSE.replace(b"HTTP/1.1 403 Forbidden", b"garbage")
+    results = main._decode_batch(_batch_response(content), 3)
+
+    assert [status for status, _ in results] == [200, 502, 400]
+    assert results[0][1]["id"] == "abc123"
+
+
+def test_create_events_maps_chunk_results_to_input_indices(monkeypatch):
+    _configure(monkeypatch)
+
+    sizes = []
+
+    def handler(request):
+        if "oauth2" in str(request.url):
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        sizes.append(request.content.count(b"Content-ID: <item"))
+        return _echo_batch(request)
+
+    titles = [f"event-{i}" for i in range(53)]
+    titles[3] = titles[51] = "fail"
+    payload = [{"name": "n", "title": t, "start": "2099-01-01T10:00:00Z"} for t in titles]
+
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(main, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        results = client.post("/create-events", json=payload).json()
+
+    assert sorted(sizes) == [3, 50]
+    assert [r["index"] for r in results] == list(range(53))
+    for i, result in enumerate(results):
+        if titles[i] == "fail":
+            assert result["event"] is None and "404" in result["error"]
+        else:
+            assert result["event"]["eventId"] == titles[i]
+
+
+def test_create_events_keeps_created_items_when_401_resend_fails(monkeypatch):
+    _configure(monkeypatch)
+
+    token_calls = []
+
+    def handler(request):
+        if "oauth2" in str(request.url):
+            token_calls.append(1)
+            if len(token_calls) > 1:
+                return httpx.Response(400, json={"error": "invalid_grant"})
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        content = (
+            b"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item0>\r\n\r\n"
+            b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n{"id": "created"}\r\n'
+            b"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item1>\r\n\r\n"
+            b'HTTP/1.1 401 Unauthorized\r\nContent-Type: application/json\r\n\r\n{"error": {"code": 401}}\r\n'
+            b"--resp--\r\n"
+        )
+        return _batch_response(content, "multipart/mixed; boundary=resp")
+
+    payload = [{"name": "n", "title": t, "start": "2099-01-01T10:00:00Z"} for t in ("a", "b")]
+
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(main, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        results = client.post("/create-events", json=payload).json()
+
+    assert len(token_calls) == 2
+    assert results[0]["event"]["eventId"] == "created"
+    assert results[1]["event"] is None and "token refresh failed" in results[1]["error"]
+
+
+def test_create_events_resolves_conflicting_parts_to_existing_events(monkeypatch):
+    _configure(monkeypatch)
+
+    def handler(request):
+        if "oauth2" in str(request.url):
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        if request.method == "GET":
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[1], "status": "confirmed"})
+        content = (
+            b"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item0>\r\n\r\n"
+            b'HTTP/1.1 409 Conflict\r\nContent-Type: application/json\r\n\r\n{"error": {"code": 409}}\r\n'
+            b"--resp--\r\n"
+        )
+        return _batch_response(content, "multipart/mixed; boundary=resp")
+
+    payload = [{"name": "n", "title": "a", "start": "2099-01-01T10:00:00Z"}]
+
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(main, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        results = client.post("/create-events", json=payload).json()
+
+    assert results[0]["event"]["eventId"] == results[0]["event"]["requestId"]
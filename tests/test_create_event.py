@@ -0,0 +1,62 @@
+import httpx
+import orjson
+from fastapi.testclient import TestClient
+
+import backend.main as main
+
+PAYLOAD = {"name": "n", "title": "Project Sync", "start": "2099-01-01T10:00:00Z"}
+
+
+def _configure(monkeypatch):
+    monkeypatch.setattr(main, "GOOGLE_CLIENT_ID", "id")
+    monkeypatch.setattr(main, "GOOGLE_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(main, "GOOGLE_REFRESH_TOKEN", "refresh")
+    monkeypatch.setattr(main, "_TOKEN_CACHE", {"token": None, "exp": 0.0})
+    monkeypatch.setattr(main, "RETRY_BASE_DELAY", 0.01)
+
+
+def _post(monkeypatch, handler):
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(main, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        return client.post("/create-event", json=PAYLOAD)
+
+
+def test_retry_after_committed_insert_returns_existing_event(monkeypatch):
+    _configure(monkeypatch)
+    calendar = {}
+
+    def handler(request):
+        if "oauth2" in str(request.url):
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        if request.method == "GET":
+            return httpx.Response(200, json=calendar[request.url.path.rsplit("/", 1)[1]])
+        body = orjson.loads(request.content)
+        if body["id"] in calendar:
+            return httpx.Response(409, json={"error": {"code": 409}})
+        # Google commits the insert but the front end answers 502.
+        calendar[body["id"]] = {**body, "status": "confirmed", "htmlLink": "https://calendar/x"}
+        return httpx.Response(502, text="Bad Gateway")
+
+    resp = _post(monkeypatch, handler)
+
+    assert resp.status_code == 200
+    assert len(calendar) == 1
+    event = resp.json()
+    assert event["eventId"] == event["requestId"] == next(iter(calendar))
+    assert event["htmlLink"] == "https://calendar/x"
+
+
+def test_conflict_with_deleted_event_is_reported(monkeypatch):
+    _configure(monkeypatch)
+
+    def handler(request):
+        if "oauth2" in str(request.url):
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        if request.method == "GET":
+            return httpx.Response(200, json={"id": "x", "status": "cancelled"})
+        return httpx.Response(409, json={"error": {"code": 409}})
+
+    resp = _post(monkeypatch, handler)
+
+    assert resp.status_code == 502
+    assert "deleted" in resp.json()["detail"]